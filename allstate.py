@@ -1,10 +1,20 @@
 import requests
-import json
+import orjson
 import sys
 import os
-from typing import Dict, List, Optional
+import atexit
+import functools
+import hashlib
+import queue
+import threading
 import time
-import re
+from typing import Dict, List, Optional
+import string
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ResponseError
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 # Configuration
 BASE_URL = "https://gateway-voters.eci.gov.in/api/v1"
@@ -12,12 +22,16 @@ STATES_ENDPOINT = f"{BASE_URL}/common/states/"
 DISTRICTS_ENDPOINT = f"{BASE_URL}/common/districts/{{stateCd}}"
 ACS_ENDPOINT = f"{BASE_URL}/common/acs/{{districtCd}}"
 PARTS_ENDPOINT = f"{BASE_URL}/printing-publish/get-part-list"
-PARTS_PAGE_SIZE = 10  # Default page size for Parts API
+PARTS_PAGE_SIZE = 500  # Large enough to return most ACs in a single page
 DATA_DIR = "data"
+MAX_WORKERS = 16  # Concurrent in-flight requests against the API
+CACHE_DIR = f"{DATA_DIR}/.cache"
+CACHE_TTL = 24 * 60 * 60  # Seconds before a cached API response is refetched
 
 # Headers for Parts API
 PARTS_HEADERS = {
     "accept": "*/*",
+    "accept-encoding": ACCEPT_ENCODING,  # Every compression urllib3 can decode here
     "accept-language": "en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7,es;q=0.6",
     "applicationname": "VSP",
     "atkn_bnd": "null",
@@ -33,33 +47,185 @@ PARTS_HEADERS = {
     "sec-fetch-site": "same-site"
 }
 
+# Shared HTTP session so every request reuses the same keep-alive connection
+SESSION = requests.Session()
+SESSION.headers.update(PARTS_HEADERS)
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # The parts POST is a read, so it is as safe to retry as the GETs
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+        respect_retry_after_header=True
+    )
+))
+atexit.register(SESSION.close)
+
+class AdaptiveDelay:
+    """AIMD pacing shared by all workers: back off on 429s, speed up again on success."""
+
+    def __init__(self, min_delay: float = 0.5, max_delay: float = 30.0, successes_to_halve: int = 10):
+        self.delay = 0.0
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.successes_to_halve = successes_to_halve
+        self.successes = 0
+        self.last_increase = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Sleep for the current delay before sending a request."""
+        delay = self.delay
+        if delay:
+            time.sleep(delay)
+
+    def on_rate_limited(self):
+        """Double the delay after the API answered with a 429, at most once per delay period."""
+        with self.lock:
+            self.successes = 0
+            # Concurrent workers hitting the same burst of 429s count as one signal
+            now = time.monotonic()
+            if self.delay and now - self.last_increase < self.delay:
+                return
+            self.delay = min(max(self.delay * 2, self.min_delay), self.max_delay)
+            self.last_increase = now
+
+    def on_success(self):
+        """Halve the delay after enough consecutive successful requests."""
+        with self.lock:
+            if not self.delay:
+                return
+            self.successes += 1
+            if self.successes >= self.successes_to_halve:
+                self.delay = self.delay / 2 if self.delay / 2 >= self.min_delay else 0.0
+                self.successes = 0
+
+PACER = AdaptiveDelay()
+
+def _request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request on the shared session, paced by PACER."""
+    PACER.wait()
+    try:
+        response = SESSION.request(method, url, timeout=10, **kwargs)
+    except requests.exceptions.RetryError as e:
+        # Retries ran out; only repeated 429s (not 5xx) mean the API is rate limiting us
+        reason = getattr(e.args[0], "reason", None) if e.args else None
+        if str(reason) == ResponseError.SPECIFIC_ERROR.format(status_code=429):
+            PACER.on_rate_limited()
+        raise
+    retries = getattr(response.raw, "retries", None)
+    if response.status_code == 429 or (retries and any(h.status == 429 for h in retries.history)):
+        PACER.on_rate_limited()
+    elif response.status_code < 400:
+        PACER.on_success()
+    return response
+
+def _fetch_json(method: str, url: str, **kwargs):
+    """Send a paced request and return its parsed JSON body, raising HTTPError on 4xx/5xx."""
+    response = _request(method, url, **kwargs)
+    if response.status_code >= 400:
+        response.raise_for_status()
+    return orjson.loads(response.content)
+
+class _FilenameTable(dict):
+    """str.translate table that keeps ASCII letters and digits and drops everything else."""
+
+    def __missing__(self, key: int):
+        self[key] = None
+        return None
+
+_FILENAME_TABLE = _FilenameTable((ord(c), ord(c)) for c in string.ascii_letters + string.digits)
+
 def sanitize_filename(name: str) -> str:
     """Sanitize names for use in folder/file names."""
-    # Replace spaces and special characters with underscores, remove invalid chars
-    return re.sub(r'[^a-zA-Z0-9]', '', name.replace(' ', '').replace('.', ''))
+    return name.translate(_FILENAME_TABLE)
+
+# Directories already created in this run, so repeat calls skip the filesystem
+_MKDIR_SEEN = set()
 
 def ensure_directory(path: str):
     """Create directory if it doesn't exist."""
+    if path in _MKDIR_SEEN:
+        return
     try:
         os.makedirs(path, exist_ok=True)
+        _MKDIR_SEEN.add(path)
     except Exception as e:
         print(f"Error creating directory {path}: {e}")
 
-def save_to_json(data: List[Dict], filename: str):
-    """Save data to a JSON file."""
+def save_to_json(data: List[Dict], filename: str, quiet: bool = False):
+    """Save data to a JSON file, announcing it unless quiet."""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"Saved data to {filename}")
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        if not quiet:
+            print(f"Saved data to {filename}")
     except Exception as e:
         print(f"Error saving to {filename}: {e}")
 
+class AsyncJsonWriter:
+    """Save JSON files from a background thread so the crawl never waits on disk."""
+
+    def __init__(self, maxsize: int = 256):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+
+    def _drain(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                # Stay quiet so this thread's output never interleaves with the crawl's
+                data, filename = item
+                save_to_json(data, filename, quiet=True)
+            finally:
+                self.queue.task_done()
+
+    def submit(self, data: List[Dict], filename: str):
+        """Queue data to be saved to filename, blocking only if the queue is full."""
+        self.queue.put((data, filename))
+
+    def close(self):
+        """Wait until every queued file has been written, then stop the thread."""
+        self.queue.put(None)
+        self.thread.join()
+
+def disk_cache(func):
+    """Cache successful results of a fetch function on disk for CACHE_TTL seconds."""
+    @functools.wraps(func)
+    def wrapper(*args):
+        key = hashlib.sha1(f"{func.__name__}:{args!r}".encode('utf-8')).hexdigest()
+        path = f"{CACHE_DIR}/{key}.json"
+        try:
+            if time.time() - os.path.getmtime(path) < CACHE_TTL:
+                with open(path, 'rb') as f:
+                    return orjson.loads(f.read())
+        except (OSError, ValueError):
+            pass
+        result = func(*args)
+        if result is not None:
+            try:
+                ensure_directory(CACHE_DIR)
+                # Write to a temp file first so concurrent readers never see a partial entry
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(result))
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"Error caching {func.__name__}{args}: {e}")
+        return result
+    return wrapper
+
+@disk_cache
 def fetch_states() -> Optional[List[Dict]]:
     """Fetch all states from the States API."""
     try:
-        response = requests.get(STATES_ENDPOINT, timeout=10)
-        response.raise_for_status()
-        states = response.json()
+        states = _fetch_json("GET", STATES_ENDPOINT)
         return [
             {
                 "stateCd": state["stateCd"],
@@ -68,17 +234,16 @@ def fetch_states() -> Optional[List[Dict]]:
             }
             for state in states if state.get("isActive") == "Y"
         ]
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching states: {e}")
         return None
 
+@disk_cache
 def fetch_districts(state_cd: str) -> Optional[List[Dict]]:
     """Fetch districts for a given state code."""
     try:
         url = DISTRICTS_ENDPOINT.format(stateCd=state_cd)
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        districts = response.json()
+        districts = _fetch_json("GET", url)
         return [
             {
                 "districtCd": district["districtCd"],
@@ -87,17 +252,16 @@ def fetch_districts(state_cd: str) -> Optional[List[Dict]]:
             }
             for district in districts if district.get("isActive") == "Y"
         ]
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching districts for state {state_cd}: {e}")
         return None
 
+@disk_cache
 def fetch_assemblies(district_cd: str) -> Optional[List[Dict]]:
     """Fetch assembly constituencies for a given district code."""
     try:
         url = ACS_ENDPOINT.format(districtCd=district_cd)
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        assemblies = response.json()
+        assemblies = _fetch_json("GET", url)
         return [
             {
                 "acNumber": assembly["asmblyNo"],
@@ -106,47 +270,124 @@ def fetch_assemblies(district_cd: str) -> Optional[List[Dict]]:
             }
             for assembly in assemblies if assembly.get("isActive") == "Y"
         ]
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching assemblies for district {district_cd}: {e}")
         return None
 
+def fetch_parts_page(body: bytes) -> List[Dict]:
+    """Fetch a single page of parts from a pre-serialized request body."""
+    # The session already sends content-type: application/json
+    data = _fetch_json("POST", PARTS_ENDPOINT, data=body)
+    if data.get("status") != "Success":
+        # An API error reported with HTTP 200 must not look like an empty AC
+        raise requests.exceptions.RequestException(
+            f"Parts API returned status {data.get('status')!r}: {data.get('message')}"
+        )
+    if not data.get("payload"):
+        return []
+    return [
+        {
+            "partNumber": part["partNumber"],
+            "partName": part["partName"]
+        }
+        for part in data["payload"]
+    ]
+
+# What this run has learned about parts pagination from page-1 probes:
+# "ignored" once the API repeats page 0 on page 1, "cap" once page 1 brings
+# new parts, and "floor", the largest first page known to be complete
+_PARTS_PAGING = {"ignored": False, "cap": None, "floor": 0}
+
+def _parts_may_be_capped(page_size: int) -> bool:
+    """Return whether a first page of page_size parts could have been cut short by a cap."""
+    if not page_size or _PARTS_PAGING["ignored"]:
+        return False
+    if _PARTS_PAGING["cap"] is not None:
+        return page_size >= _PARTS_PAGING["cap"]
+    return page_size >= _PARTS_PAGING["floor"]
+
+def _learn_parts_paging(page_size: int, page: List[Dict], new_parts: List[Dict]):
+    """Record what a page-1 probe of page_size parts says about the API's pagination."""
+    if page and not new_parts:
+        # The API has been seen ignoring pagination and returning the whole AC on every page
+        _PARTS_PAGING["ignored"] = True
+    elif new_parts:
+        _PARTS_PAGING["cap"] = page_size
+    else:
+        _PARTS_PAGING["floor"] = max(_PARTS_PAGING["floor"], page_size)
+
+@disk_cache
 def fetch_parts(state_cd: str, district_cd: str, ac_number: int) -> Optional[List[Dict]]:
-    """Fetch all parts (polling stations) for a given AC, handling pagination."""
+    """Fetch all parts (polling stations) for a given AC, handling pagination.
+
+    Returns an empty list for an AC without parts and None if fetching failed.
+    """
     parts = []
-    page_number = 0
-    while True:
-        try:
-            payload = {
-                "stateCd": state_cd,
-                "districtCd": district_cd,
-                "acNumber": ac_number,
-                "pageNumber": page_number,
-                "pageSize": PARTS_PAGE_SIZE
-            }
-            response = requests.post(PARTS_ENDPOINT, headers=PARTS_HEADERS, json=payload, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("status") != "Success" or not data.get("payload"):
-                print(f"No more parts for AC {ac_number}, district {district_cd}")
+    payload = {
+        "stateCd": state_cd,
+        "districtCd": district_cd,
+        "acNumber": ac_number,
+        "pageNumber": 0,
+        "pageSize": PARTS_PAGE_SIZE
+    }
+    try:
+        # Ask for the whole AC in one request; most fit in a single page
+        parts.extend(fetch_parts_page(orjson.dumps(payload)))
+        
+        page_size = len(parts)
+        if not _parts_may_be_capped(page_size):
+            return parts
+        
+        # Keep asking for pages of the size the API actually returned until one
+        # comes back short. Pages are fetched inline so the crawl's worker pool
+        # stays the only source of concurrency.
+        seen = {part["partNumber"] for part in parts}
+        payload["pageSize"] = page_size
+        page_number = 1
+        while True:
+            payload["pageNumber"] = page_number
+            page = fetch_parts_page(orjson.dumps(payload))
+            new_parts = [part for part in page if part["partNumber"] not in seen]
+            seen.update(part["partNumber"] for part in new_parts)
+            parts.extend(new_parts)
+            if page_number == 1:
+                _learn_parts_paging(page_size, page, new_parts)
+            if len(page) < page_size or not new_parts:
                 break
-            parts.extend([
-                {
-                    "partNumber": part["partNumber"],
-                    "partName": part["partName"]
-                }
-                for part in data["payload"]
-            ])
             page_number += 1
-            if len(data["payload"]) < PARTS_PAGE_SIZE:
-                break
-            time.sleep(1)  # Avoid rate-limiting
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching parts for AC {ac_number}, district {district_cd}, page {page_number}: {e}")
-            break
-    return parts if parts else None
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        # Drop partial results so an incomplete AC is never cached
+        print(f"Error fetching parts for AC {ac_number}, district {district_cd}: {e}")
+        return None
+    return parts
+
+def drop_unfinished_parts(filename: str, completed: set):
+    """Rewrite an NDJSON parts file keeping only lines for ACs listed in completed.
+
+    A crash after an AC's parts were written but before it reached done.log
+    would otherwise leave lines that the resumed run appends a second time.
+    """
+    if not os.path.exists(filename):
+        return
+    tmp_path = f"{filename}.tmp"
+    with open(filename, 'rb') as src, open(tmp_path, 'wb') as dst:
+        for line in src:
+            try:
+                part = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # Torn final line from the crash
+                continue
+            if f"{part['districtCd']},{part['acNumber']}" in completed:
+                dst.write(line)
+    os.replace(tmp_path, filename)
 
 def build_election_data(state_cd: str):
-    """Build and save election data for a given state code in folder structure."""
+    """Build and save election data for a given state code.
+
+    States, districts and assemblies are saved as JSON in a folder structure;
+    parts for the whole state are streamed to <state_dir>/parts.ndjson, one
+    JSON object per line.
+    """
     # Fetch and save states
     states = fetch_states()
     if not states:
@@ -156,7 +397,8 @@ def build_election_data(state_cd: str):
     save_to_json(states, f"{DATA_DIR}/allstates.json")
     
     # Find the state
-    state = next((s for s in states if s["stateCd"] == state_cd), None)
+    states_by_cd = {s["stateCd"]: s for s in states}
+    state = states_by_cd.get(state_cd)
     if not state:
         print(f"State code {state_cd} not found.")
         return
@@ -169,31 +411,83 @@ def build_election_data(state_cd: str):
     if districts is None:
         print(f"No districts found for state {state_cd}.")
         return
-    save_to_json(districts, f"{state_dir}/districts.json")
+    writer = AsyncJsonWriter()
+    writer.submit(districts, f"{state_dir}/districts.json")
     
-    # Fetch assemblies and parts for each district
-    for district in districts:
-        district_name = sanitize_filename(district["districtValue"])
-        district_dir = f"{state_dir}/{district_name}"
-        ensure_directory(district_dir)
-        
-        assemblies = fetch_assemblies(district["districtCd"])
-        if assemblies is None:
-            print(f"No assemblies found for district {district['districtCd']}.")
-            continue
-        save_to_json(assemblies, f"{district_dir}/assemblies.json")
+    try:
+        # ACs finished by an earlier, interrupted run are listed in done.log
+        done_path = f"{state_dir}/done.log"
+        completed = set()
+        if os.path.exists(done_path):
+            with open(done_path, 'r', encoding='utf-8') as f:
+                completed = set(f.read().splitlines())
+            print(f"Resuming: skipping {len(completed)} completed ACs from {done_path}")
+            drop_unfinished_parts(f"{state_dir}/parts.ndjson", completed)
         
-        # Fetch parts for each assembly
-        for assembly in assemblies:
-            assembly_name = sanitize_filename(assembly["asmblyName"])
-            assembly_dir = f"{district_dir}/{assembly_name}"
-            ensure_directory(assembly_dir)
+        failed = False
+        executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        try:
+            # Fetch assemblies for all districts concurrently
+            district_assemblies = executor.map(lambda d: fetch_assemblies(d["districtCd"]), districts)
             
-            parts = fetch_parts(state_cd, district["districtCd"], assembly["acNumber"])
-            if parts is None:
-                print(f"No parts found for AC {assembly['acNumber']}, district {district['districtCd']}.")
-                continue
-            save_to_json(parts, f"{assembly_dir}/assemblies-part.json")
+            # Queue parts fetches for each assembly as soon as its district is known
+            jobs = {}
+            for district, assemblies in zip(districts, district_assemblies):
+                district_name = sanitize_filename(district["districtValue"])
+                district_dir = f"{state_dir}/{district_name}"
+                ensure_directory(district_dir)
+                
+                if assemblies is None:
+                    print(f"No assemblies found for district {district['districtCd']}.")
+                    failed = True
+                    continue
+                writer.submit(assemblies, f"{district_dir}/assemblies.json")
+                
+                for assembly in assemblies:
+                    if f"{district['districtCd']},{assembly['acNumber']}" in completed:
+                        continue
+                    future = executor.submit(fetch_parts, state_cd, district["districtCd"], assembly["acNumber"])
+                    jobs[future] = (district, assembly)
+            
+            # Stream parts into a single NDJSON file in completion order, appending
+            # to the earlier output when resuming
+            parts_mode = 'ab' if completed else 'wb'
+            with open(f"{state_dir}/parts.ndjson", parts_mode) as parts_file, \
+                    open(done_path, 'a', encoding='utf-8') as done_file:
+                for future in as_completed(jobs):
+                    district, assembly = jobs[future]
+                    parts = future.result()
+                    if parts is None:
+                        print(f"Failed to fetch parts for AC {assembly['acNumber']}, district {district['districtCd']}.")
+                        failed = True
+                        continue
+                    if not parts:
+                        print(f"No parts found for AC {assembly['acNumber']}, district {district['districtCd']}.")
+                    parts_file.writelines(
+                        orjson.dumps({
+                            "districtCd": district["districtCd"],
+                            "acNumber": assembly["acNumber"],
+                            **part
+                        }) + b"\n"
+                        for part in parts
+                    )
+                    # Parts must reach disk before the AC is marked done
+                    parts_file.flush()
+                    done_file.write(f"{district['districtCd']},{assembly['acNumber']}\n")
+                    done_file.flush()
+                    print(f"Saved {len(parts)} parts for AC {assembly['acNumber']} to {parts_file.name}")
+        except BaseException:
+            # Drop queued fetches so an error or Ctrl-C stops the crawl promptly
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        
+        # A complete crawl needs no checkpoint; keep it if any AC still has to be retried
+        if not failed:
+            os.remove(done_path)
+    finally:
+        # Make sure queued files reach disk even if the crawl raised
+        writer.close()
 
 def main():
     """Main function to run the data collection."""
@@ -1,17 +1,19 @@
 import requests
-import json
+import orjson
 import sys
 import os
 import logging
 from typing import Dict, List, Optional
 import time
-import re
+import string
+from concurrent.futures import Executor, ThreadPoolExecutor
 from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(
-    level=logging.DEBUG,  # Set to DEBUG for detailed logs
+    level=logging.INFO,  # Set to DEBUG for detailed logs
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler('election_data.log', encoding='utf-8'),
@@ -28,10 +30,12 @@ ACS_ENDPOINT = f"{BASE_URL}/common/acs/{{districtCd}}"
 PARTS_ENDPOINT = f"{BASE_URL}/printing-publish/get-part-list"
 PARTS_PAGE_SIZE = 10  # Kept for consistency with curl payload
 DATA_DIR = "data"
+MAX_WORKERS = 10  # Threads per pool; enough to keep the API busy without overloading it
 
 # Headers to match curl command exactly
 PARTS_HEADERS = {
     "Accept": "*/*",
+    "Accept-Encoding": ACCEPT_ENCODING,  # Every compression urllib3 can decode here
     "Accept-Language": "en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7,es;q=0.6",
     "Connection": "keep-alive",
     "Origin": "https://voters.eci.gov.in",
@@ -50,19 +54,31 @@ PARTS_HEADERS = {
     "Sec-Fetch-Site": "same-site"
 }
 
+class _FilenameTable(dict):
+    """str.translate table that keeps ASCII letters and digits and drops everything else."""
+
+    def __missing__(self, key: int):
+        self[key] = None
+        return None
+
+_FILENAME_TABLE = _FilenameTable((ord(c), ord(c)) for c in string.ascii_letters + string.digits)
+
 def sanitize_filename(name: str) -> str:
     """Sanitize names for use in folder/file names."""
-    logger.debug(f"Sanitizing filename: {name}")
-    sanitized = re.sub(r'[^a-zA-Z0-9]', '', name.replace(' ', '').replace('.', ''))
-    logger.debug(f"Sanitized to: {sanitized}")
-    return sanitized
+    return name.translate(_FILENAME_TABLE)
+
+# Directories already created in this run, so repeat calls skip the filesystem
+_MKDIR_SEEN = set()
 
 def ensure_directory(path: str):
     """Create directory if it doesn't exist."""
+    if path in _MKDIR_SEEN:
+        return
     logger.info(f"Ensuring directory exists: {path}")
     try:
         os.makedirs(path, exist_ok=True)
-        logger.debug(f"Directory {path} created or already exists")
+        _MKDIR_SEEN.add(path)
+        logger.debug("Directory %s created or already exists", path)
     except Exception as e:
         logger.error(f"Error creating directory {path}: {e}")
 
@@ -70,8 +86,8 @@ def save_to_json(data: List[Dict], filename: str):
     """Save data to a JSON file."""
     logger.info(f"Saving data to {filename}")
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         logger.info(f"Successfully saved data to {filename}")
     except Exception as e:
         logger.error(f"Error saving to {filename}: {e}")
@@ -83,8 +99,8 @@ def create_session() -> requests.Session:
     session.headers.update(PARTS_HEADERS)
     # Add retry logic for transient errors
     retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-    session.mount('https://', HTTPAdapter(max_retries=retries))
-    logger.debug(f"Session headers: {session.headers}")
+    # One pooled connection per worker in both the district and parts pools
+    session.mount('https://', HTTPAdapter(pool_maxsize=2 * MAX_WORKERS, max_retries=retries))
     return session
 
 def fetch_states(session: requests.Session) -> Optional[List[Dict]]:
@@ -92,10 +108,10 @@ def fetch_states(session: requests.Session) -> Optional[List[Dict]]:
     logger.info(f"Fetching states from {STATES_ENDPOINT}")
     try:
         response = session.get(STATES_ENDPOINT, timeout=10)
-        logger.debug(f"States API response status: {response.status_code}")
+        logger.debug("States API response status: %s", response.status_code)
         response.raise_for_status()
-        states = response.json()
-        logger.debug(f"Received {len(states)} states")
+        states = orjson.loads(response.content)
+        logger.debug("Received %d states", len(states))
         filtered_states = [
             {
                 "stateCd": state["stateCd"],
@@ -106,7 +122,7 @@ def fetch_states(session: requests.Session) -> Optional[List[Dict]]:
         ]
         logger.info(f"Filtered {len(filtered_states)} active states")
         return filtered_states
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         logger.error(f"Error fetching states: {e}")
         return None
 
@@ -116,10 +132,10 @@ def fetch_districts(session: requests.Session, state_cd: str) -> Optional[List[D
     logger.info(f"Fetching districts for state {state_cd} from {url}")
     try:
         response = session.get(url, timeout=10)
-        logger.debug(f"Districts API response status: {response.status_code}")
+        logger.debug("Districts API response status: %s", response.status_code)
         response.raise_for_status()
-        districts = response.json()
-        logger.debug(f"Received {len(districts)} districts for state {state_cd}")
+        districts = orjson.loads(response.content)
+        logger.debug("Received %d districts for state %s", len(districts), state_cd)
         filtered_districts = [
             {
                 "districtCd": district["districtCd"],
@@ -130,7 +146,7 @@ def fetch_districts(session: requests.Session, state_cd: str) -> Optional[List[D
         ]
         logger.info(f"Filtered {len(filtered_districts)} active districts for state {state_cd}")
         return filtered_districts
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         logger.error(f"Error fetching districts for state {state_cd}: {e}")
         return None
 
@@ -140,13 +156,13 @@ def fetch_assemblies(session: requests.Session, district_cd: str) -> Optional[Li
     logger.info(f"Fetching assemblies for district {district_cd} from {url}")
     try:
         response = session.get(url, timeout=10)
-        logger.debug(f"Assemblies API response status: {response.status_code}")
+        logger.debug("Assemblies API response status: %s", response.status_code)
         response.raise_for_status()
-        assemblies = response.json()
+        assemblies = orjson.loads(response.content)
         if not assemblies:
             logger.warning(f"No assemblies found for district {district_cd}")
             return []
-        logger.debug(f"Received {len(assemblies)} assemblies for district {district_cd}")
+        logger.debug("Received %d assemblies for district %s", len(assemblies), district_cd)
         filtered_assemblies = []
         for assembly in assemblies:
             if assembly.get("isActive") != "Y":
@@ -165,7 +181,7 @@ def fetch_assemblies(session: requests.Session, district_cd: str) -> Optional[Li
     except requests.exceptions.HTTPError as e:
         logger.error(f"HTTP error fetching assemblies for district {district_cd}: {e}")
         return None
-    except requests.exceptions.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON response for district {district_cd}: {e}")
         return None
     except requests.exceptions.RequestException as e:
@@ -183,10 +199,10 @@ def fetch_parts(session: requests.Session, state_cd: str, district_cd: str, ac_n
             "pageNumber": 0,  # Kept for consistency with curl
             "pageSize": PARTS_PAGE_SIZE  # Kept for consistency
         }
-        logger.debug(f"Sending POST request to {PARTS_ENDPOINT} with headers: {session.headers}, payload: {payload}")
-        logger.debug(f"Session cookies: {session.cookies.get_dict()}")
-        response = session.post(PARTS_ENDPOINT, json=payload, timeout=15)
-        logger.debug(f"Parts API response status: {response.status_code}")
+        body = orjson.dumps(payload)
+        logger.debug("Sending POST request to %s with payload: %s", PARTS_ENDPOINT, payload)
+        response = session.post(PARTS_ENDPOINT, data=body, timeout=15)
+        logger.debug("Parts API response status: %s", response.status_code)
         if response.status_code == 401:
             logger.error("Unauthorized: API key or token may be required")
             return None
@@ -196,12 +212,12 @@ def fetch_parts(session: requests.Session, state_cd: str, district_cd: str, ac_n
         if response.status_code == 429:
             logger.warning("Rate limit exceeded. Retrying after 5 seconds...")
             time.sleep(5)
-            response = session.post(PARTS_ENDPOINT, json=payload, timeout=15)
-            logger.debug(f"Retry response status: {response.status_code}")
+            response = session.post(PARTS_ENDPOINT, data=body, timeout=15)
+            logger.debug("Retry response status: %s", response.status_code)
         response.raise_for_status()
         try:
-            data = response.json()
-            logger.debug(f"Parts API response: {data}")
+            data = orjson.loads(response.content)
+            logger.debug("Parts API response: %s", data)
         except ValueError as e:
             logger.error(f"Invalid JSON response for AC {ac_number}, district {district_cd}: {e}, Response: {response.text}")
             return None
@@ -224,6 +240,39 @@ def fetch_parts(session: requests.Session, state_cd: str, district_cd: str, ac_n
         logger.error(f"Error fetching parts for AC {ac_number}, district {district_cd}: {e}")
         return None
 
+def process_assembly(session: requests.Session, state_cd: str, district: Dict, assembly: Dict, district_dir: str):
+    """Fetch and save parts for a single assembly."""
+    assembly_name = sanitize_filename(assembly["asmblyName"])
+    assembly_dir = f"{district_dir}/{assembly_name}"
+    ensure_directory(assembly_dir)
+    
+    logger.info(f"Fetching parts for AC {assembly['acNumber']}, district {district['districtCd']}")
+    parts = fetch_parts(session, state_cd, district["districtCd"], assembly["acNumber"])
+    if parts is None:
+        logger.error(f"No parts found for AC {assembly['acNumber']}, district {district['districtCd']}.")
+        return
+    save_to_json(parts, f"{assembly_dir}/assemblies-part.json")
+
+def process_district(session: requests.Session, parts_executor: Executor, state_cd: str, state_dir: str, district: Dict):
+    """Fetch and save assemblies for a district, then its parts on parts_executor."""
+    district_name = sanitize_filename(district["districtValue"])
+    district_dir = f"{state_dir}/{district_name}"
+    ensure_directory(district_dir)
+    
+    logger.info(f"Fetching assemblies for district {district['districtCd']}")
+    assemblies = fetch_assemblies(session, district["districtCd"])
+    if assemblies is None:
+        logger.error(f"No assemblies found for district {district['districtCd']}.")
+        return
+    save_to_json(assemblies, f"{district_dir}/assemblies.json")
+    
+    futures = [
+        parts_executor.submit(process_assembly, session, state_cd, district, assembly, district_dir)
+        for assembly in assemblies
+    ]
+    for future in futures:
+        future.result()
+
 def build_election_data(state_cd: str):
     """Build and save election data for a given state code in folder structure."""
     logger.info(f"Starting data collection for state {state_cd}")
@@ -241,7 +290,8 @@ def build_election_data(state_cd: str):
     save_to_json(states, f"{DATA_DIR}/allstates.json")
     
     # Find the state
-    state = next((s for s in states if s["stateCd"] == state_cd), None)
+    states_by_cd = {s["stateCd"]: s for s in states}
+    state = states_by_cd.get(state_cd)
     if not state:
         logger.error(f"State code {state_cd} not found.")
         return
@@ -257,39 +307,49 @@ def build_election_data(state_cd: str):
         return
     save_to_json(districts, f"{state_dir}/districts.json")
     
-    # Fetch assemblies and parts for each district
-    for district in districts:
-        district_name = sanitize_filename(district["districtValue"])
-        district_dir = f"{state_dir}/{district_name}"
-        ensure_directory(district_dir)
-        
-        logger.info(f"Fetching assemblies for district {district['districtCd']}")
-        assemblies = fetch_assemblies(session, district["districtCd"])
-        if assemblies is None:
-            logger.error(f"No assemblies found for district {district['districtCd']}.")
-            continue
-        save_to_json(assemblies, f"{district_dir}/assemblies.json")
-        
-        # Fetch parts for each assembly
-        for assembly in assemblies:
-            assembly_name = sanitize_filename(assembly["asmblyName"])
-            assembly_dir = f"{district_dir}/{assembly_name}"
-            ensure_directory(assembly_dir)
-            
-            logger.info(f"Fetching parts for AC {assembly['acNumber']}, district {district['districtCd']}")
-            parts = fetch_parts(session, state_cd, district["districtCd"], assembly["acNumber"])
-            if parts is None:
-                logger.error(f"No parts found for AC {assembly['acNumber']}, district {district['districtCd']}.")
-                continue
-            save_to_json(parts, f"{assembly_dir}/assemblies-part.json")
+    # Fetch assemblies for districts concurrently, handing parts to a separate
+    # pool so district workers never wait on tasks queued behind themselves
+    district_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    parts_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        list(district_executor.map(
+            lambda district: process_district(session, parts_executor, state_cd, state_dir, district),
+            districts
+        ))
+    except BaseException:
+        # Drop queued work so an error or Ctrl-C stops the crawl promptly
+        district_executor.shutdown(wait=False, cancel_futures=True)
+        parts_executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    district_executor.shutdown()
+    parts_executor.shutdown()
     
     session.close()
     logger.info("HTTP session closed")
 
+def probe_parts(target: str):
+    """Fetch and print parts for a single AC given as <stateCd>/<districtCd>/<acNumber>."""
+    try:
+        state_cd, district_cd, ac_number = target.split("/")
+        ac_number = int(ac_number)
+    except ValueError:
+        logger.error(f"Invalid probe target {target}. Expected <stateCd>/<districtCd>/<acNumber>, e.g. S24/S2408/86")
+        sys.exit(1)
+    
+    session = create_session()
+    parts = fetch_parts(session, state_cd.upper(), district_cd.upper(), ac_number)
+    session.close()
+    if parts is None:
+        sys.exit(1)
+    print(orjson.dumps(parts, option=orjson.OPT_INDENT_2).decode('utf-8'))
+
 def main():
     """Main function to run the data collection."""
+    if len(sys.argv) == 3 and sys.argv[1] == "--probe":
+        probe_parts(sys.argv[2])
+        return
     if len(sys.argv) != 2:
-        logger.error("Invalid usage. Usage: python fetch_election_data.py <stateCd>")
+        logger.error("Invalid usage. Usage: python v2.py <stateCd> | python v2.py --probe <stateCd>/<districtCd>/<acNumber>")
         sys.exit(1)
     
     state_cd = sys.argv[1].upper()